@@ -8,10 +8,405 @@
 #   functionality.
 
 
-import pygame
-from constants import BG_X_OFFSET, BG_Y_OFFSET
+import os
+import random
+from constants import BG_X_OFFSET, BG_Y_OFFSET, SQUARE_SIZE
 from termcolor import colored
 
+# with JANGGI_HEADLESS=1 in the environment the game is used without a
+# display: pygame is not imported, and load_image and Board.draw_board
+# are not available
+HEADLESS = os.environ.get("JANGGI_HEADLESS") == "1"
+if not HEADLESS:
+    import pygame
+
+# lookup tables for converting between algebraic notation (i.e. 'b7')
+# and row/column notation (i.e. (6, 1)) for each of the 90 squares
+DECODE = {
+    column + str(row + 1): (row, index)
+    for index, column in enumerate("abcdefghi") for row in range(10)
+}
+ENCODE = {row_column: location for location, row_column in DECODE.items()}
+# and from algebraic notation straight to the index on the game board
+INDEX = {location: row * 9 + column
+         for location, (row, column) in DECODE.items()}
+
+
+def build_attack_masks():
+    """
+    Builds a table of attack masks for each type of piece. The board
+    is addressed as a flat list of 90 squares where the index of a
+    square is row * 9 + column, and a mask is an integer with one bit
+    set for each square of the board (bit 0 is 'a1', bit 89 is 'i10').
+    ATTACK_MASKS[name][index] is a mask of every square from which a
+    piece of that type could reach the square at index on an empty
+    board. The masks are a superset of the legal moves (they ignore
+    blocking pieces and the direction a Soldier moves) and are only
+    used to narrow down which pieces need to be asked whether they
+    can make a legal move to a square.
+
+    :return: dictionary mapping piece names to lists of 90 masks
+    """
+    king_steps = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                  (0, 1), (1, -1), (1, 0), (1, 1)]
+    steps = {
+        "GN": king_steps,
+        "GD": king_steps,
+        "SD": king_steps,
+        "HO": [(-2, -1), (-2, 1), (2, -1), (2, 1),
+               (-1, -2), (-1, 2), (1, -2), (1, 2)],
+        "EL": [(-3, -2), (-3, 2), (3, -2), (3, 2),
+               (-2, -3), (-2, 3), (2, -3), (2, 3)]
+    }
+    palaces = [
+        [(row, column) for row in range(0, 3) for column in range(3, 6)],
+        [(row, column) for row in range(7, 10) for column in range(3, 6)]
+    ]
+    masks = {name: [0] * 90 for name in
+             ["GN", "GD", "EL", "HO", "CH", "CA", "SD"]}
+
+    for row in range(10):
+        for column in range(9):
+            index = row * 9 + column
+
+            # pieces that move a fixed distance
+            for name in steps:
+                for row_step, column_step in steps[name]:
+                    to_row = row + row_step
+                    to_col = column + column_step
+                    if 0 <= to_row < 10 and 0 <= to_col < 9:
+                        masks[name][index] |= 1 << (to_row * 9 + to_col)
+
+            # Chariots and Cannons move along rows and columns
+            # and along the diagonals of the palace
+            line = 0
+            for to_col in range(9):
+                line |= 1 << (row * 9 + to_col)
+            for to_row in range(10):
+                line |= 1 << (to_row * 9 + column)
+            for palace in palaces:
+                if (row, column) in palace:
+                    for to_row, to_col in palace:
+                        line |= 1 << (to_row * 9 + to_col)
+            line &= ~(1 << index)
+            masks["CH"][index] = line
+            masks["CA"][index] = line
+
+    return masks
+
+
+ATTACK_MASKS = build_attack_masks()
+
+
+def build_leg_tables():
+    """
+    Builds tables of the squares that a Horse or an Elephant passes
+    through on each of its moves. A Horse passes through the square
+    next to it in the direction of the longer side of its move, and an
+    Elephant passes through that square and then the diagonal square
+    beyond it. LEG_MASKS[name][(source, destination)] is a mask of
+    those squares for a move between two indexes of the board; a move
+    that is missing from the table is not physically allowed.
+    LEG_PATHS[name][(source, destination)] holds the same squares, in
+    the order they are passed through, for a move between two
+    locations in algebraic notation.
+
+    :return: (LEG_MASKS, LEG_PATHS) - dictionaries mapping "HO" and
+             "EL" to dictionaries of masks and of tuples of locations
+    """
+    masks = {"HO": {}, "EL": {}}
+    paths = {"HO": {}, "EL": {}}
+
+    for row in range(10):
+        for column in range(9):
+            for row_step, column_step in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                # the square next to the piece
+                leg_row = row + row_step
+                leg_col = column + column_step
+                if not (0 <= leg_row < 10 and 0 <= leg_col < 9):
+                    continue
+                leg = 1 << (leg_row * 9 + leg_col)
+                for side in [-1, 1]:
+                    # a Horse steps diagonally off the leg to either side,
+                    # and an Elephant takes one more diagonal step
+                    row_diag = row_step + side * column_step
+                    col_diag = column_step + side * row_step
+                    horse_row = leg_row + row_diag
+                    horse_col = leg_col + col_diag
+                    elephant_row = horse_row + row_diag
+                    elephant_col = horse_col + col_diag
+                    source = ENCODE[(row, column)]
+                    if 0 <= horse_row < 10 and 0 <= horse_col < 9:
+                        move = (row * 9 + column, horse_row * 9 + horse_col)
+                        masks["HO"][move] = leg
+                        move = (source, ENCODE[(horse_row, horse_col)])
+                        paths["HO"][move] = (ENCODE[(leg_row, leg_col)],)
+                    if 0 <= elephant_row < 10 and 0 <= elephant_col < 9:
+                        move = (row * 9 + column,
+                                elephant_row * 9 + elephant_col)
+                        masks["EL"][move] = (
+                            leg | 1 << (horse_row * 9 + horse_col))
+                        move = (source, ENCODE[(elephant_row, elephant_col)])
+                        paths["EL"][move] = (ENCODE[(leg_row, leg_col)],
+                                             ENCODE[(horse_row, horse_col)])
+
+    return masks, paths
+
+
+LEG_MASKS, LEG_PATHS = build_leg_tables()
+
+# the order in which any_attacker asks each type of piece: Chariots and
+# Cannons line up with a General most often, and a General or Guard can
+# only attack from inside the palace
+ATTACK_ORDER = ("CH", "CA", "HO", "EL", "SD", "GN", "GD")
+
+# the squares of each player's palace, as sets of locations in
+# algebraic notation
+PALACES = {
+    "blue": frozenset(["d8", "d9", "d10", "e8", "e9", "e10",
+                       "f8", "f9", "f10"]),
+    "red": frozenset(["d1", "d2", "d3", "e1", "e2", "e3",
+                      "f1", "f2", "f3"])
+}
+# the squares of both palaces, and their corners and centers
+PALACE = PALACES["blue"] | PALACES["red"]
+PALACE_CORNERS = frozenset(["d1", "f1", "d3", "f3", "d8", "f8", "d10", "f10"])
+PALACE_CENTERS = frozenset(["e2", "e9"])
+# the moves a General or Guard may make as (source, destination) pairs
+PALACE_MOVES = frozenset(
+    (source, destination)
+    for source in DECODE for destination in PALACE
+    if abs(DECODE[source][0] - DECODE[destination][0]) <= 1
+    and abs(DECODE[source][1] - DECODE[destination][1]) <= 1
+    and (DECODE[source][0] == DECODE[destination][0]
+         or DECODE[source][1] == DECODE[destination][1]
+         or (source in PALACE_CORNERS and destination in PALACE_CENTERS)
+         or (source in PALACE_CENTERS and destination in PALACE_CORNERS))
+)
+# the squares a General can step to from each square of its own
+# palace, as masks by color and index
+GENERAL_NEIGHBORS = {
+    color: {
+        INDEX[source]: sum(1 << INDEX[destination]
+                           for destination in PALACES[color]
+                           if destination != source
+                           and (source, destination) in PALACE_MOVES)
+        for source in PALACES[color]
+    }
+    for color in PALACES
+}
+
+
+def build_soldier_moves():
+    """
+    Builds a table of the moves a Soldier can make. A Soldier moves
+    one square forward, toward the opponent's side of the board, or
+    one square to the left or right. Inside a palace it may also move
+    one square along a diagonal toward the far edge of the board
+    ('d3' or 'f3' to 'e2', 'e2' to 'd1' or 'f1', 'd8' or 'f8' to 'e9',
+    and 'e9' to 'd10' or 'f10'), whatever its color.
+    SOLDIER_MOVES[color][source] is a frozenset of the locations a
+    Soldier of that color can move to from the source location.
+
+    :return: dictionary mapping colors to dictionaries mapping
+             locations to frozensets of locations
+    """
+    forward = {"blue": -1, "red": 1}  # the row step of a forward move
+    diagonals = {"d3": ["e2"], "f3": ["e2"], "e2": ["d1", "f1"],
+                 "d8": ["e9"], "f8": ["e9"], "e9": ["d10", "f10"]}
+    moves = {}
+
+    for color, row_step in forward.items():
+        moves[color] = {}
+        for source, (row, column) in DECODE.items():
+            steps = [(row + row_step, column),
+                     (row, column - 1), (row, column + 1)]
+            destinations = {ENCODE[step] for step in steps if step in ENCODE}
+            destinations.update(diagonals.get(source, []))
+            moves[color][source] = frozenset(destinations)
+
+    return moves
+
+
+SOLDIER_MOVES = build_soldier_moves()
+
+
+def build_line_paths():
+    """
+    Builds tables of the squares that a Chariot or a Cannon passes
+    through on each of its moves. Both move any distance along a row
+    or a column, and along the diagonals of either palace: from a
+    corner to the center, from the center to a corner, and from a
+    corner through the center to the opposite corner.
+    LINE_PATHS[(source, destination)] is a mask of the squares strictly
+    between two indexes of the board; a move that is missing from the
+    table is not along a line.
+    LINE_SQUARES[(source, destination)] holds the same squares, in the
+    order they are passed through, for a move between two locations
+    in algebraic notation.
+
+    :return: (LINE_PATHS, LINE_SQUARES) - dictionaries of masks and of
+             tuples of locations
+    """
+    paths = {}
+    squares = {}
+
+    for row in range(10):
+        for column in range(9):
+            source = row * 9 + column
+            for row_step, column_step in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                # walk to the edge of the board, collecting the squares
+                # passed through on the way
+                path = 0
+                passed = ()
+                to_row = row + row_step
+                to_col = column + column_step
+                while 0 <= to_row < 10 and 0 <= to_col < 9:
+                    destination = to_row * 9 + to_col
+                    paths[(source, destination)] = path
+                    squares[(ENCODE[(row, column)],
+                             ENCODE[(to_row, to_col)])] = passed
+                    path |= 1 << destination
+                    passed += (ENCODE[(to_row, to_col)],)
+                    to_row += row_step
+                    to_col += column_step
+
+    for center in PALACE_CENTERS:
+        center_row, center_col = DECODE[center]
+        center_index = INDEX[center]
+        for row_step in [-1, 1]:
+            for column_step in [-1, 1]:
+                corner = (center_row + row_step, center_col + column_step)
+                opposite = (center_row - row_step, center_col - column_step)
+                for move, path, passed in [
+                        ((corner, (center_row, center_col)), 0, ()),
+                        (((center_row, center_col), corner), 0, ()),
+                        ((corner, opposite), 1 << center_index, (center,))]:
+                    (from_row, from_col), (to_row, to_col) = move
+                    paths[(from_row * 9 + from_col,
+                           to_row * 9 + to_col)] = path
+                    squares[(ENCODE[move[0]], ENCODE[move[1]])] = passed
+
+    return paths, squares
+
+
+LINE_PATHS, LINE_SQUARES = build_line_paths()
+
+
+def build_zobrist_keys():
+    """
+    Builds a table of random 64-bit keys for Zobrist hashing.
+    ZOBRIST[name][color][index] is the key for a piece of a given type
+    and color standing on the square at index. The hash of a position
+    is the XOR of the keys of every piece on the board, which can be
+    updated as pieces move by XOR-ing keys in and out. A fixed seed
+    keeps the keys the same from run to run.
+
+    :return: dictionary mapping piece names to dictionaries mapping
+             colors to lists of 90 keys
+    """
+    generator = random.Random(2021)
+    return {
+        name: {
+            color: [generator.getrandbits(64) for index in range(90)]
+            for color in ["blue", "red"]
+        }
+        for name in ["GN", "GD", "EL", "HO", "CH", "CA", "SD"]
+    }
+
+
+ZOBRIST = build_zobrist_keys()
+
+# maximum number of positions remembered in each transposition table
+TABLE_SIZE = 65536
+
+# the (x, y) location on the display of the upper-left corner of each
+# square, by index of the game board, computed once for every square
+SQUARE_XY = tuple(
+    (SQUARE_SIZE * (index % 9) + BG_X_OFFSET,
+     SQUARE_SIZE * (index // 9) + BG_Y_OFFSET)
+    for index in range(90)
+)
+
+# the rect of each square on the display and the matching area of the
+# background image, by index of the game board. draw_board returns the
+# display rects of the squares it drew, so they must not be modified
+if not HEADLESS:
+    SQUARE_RECTS = tuple(
+        pygame.Rect(x, y, SQUARE_SIZE, SQUARE_SIZE) for x, y in SQUARE_XY)
+    BACKGROUND_AREAS = tuple(
+        rect.move(-BG_X_OFFSET, -BG_Y_OFFSET) for rect in SQUARE_RECTS)
+
+# images that have already been loaded, keyed by filename
+IMAGE_CACHE = {}
+
+
+def load_image(filename):
+    """
+    Loads an image for drawing on the display. Each image is only
+    read from disk and converted to the display's pixel format once;
+    after that the Surface is returned from IMAGE_CACHE. The display
+    mode must be set before the first call. Raises RuntimeError if
+    JANGGI_HEADLESS is set, since pygame is then not imported.
+
+    :param filename: string - path to the image file
+    :return: pygame Surface containing the image
+    """
+    if HEADLESS:
+        raise RuntimeError("load_image requires pygame "
+                           "(JANGGI_HEADLESS is set)")
+    image = IMAGE_CACHE.get(filename)
+    if image is None:
+        image = pygame.image.load(filename).convert_alpha()
+        IMAGE_CACHE[filename] = image
+    return image
+
+
+def palace_step_is_legal(piece, source, destination):
+    """
+    Determines if a General or Guard can legally move from the source
+    to the destination. Both pieces follow the same rules: the
+    destination must be in the palace, at most 1 square away and not
+    occupied by a friendly piece, and diagonal moves are only allowed
+    between the corners and the center of the palace.
+
+    :param piece: General or Guard object making the move
+    :param source: string - algebraic notation for a location
+                            on the board
+    :param destination: string - algebraic notation for a location
+                                 on the board
+    :return: True if the move is legal
+             False if the move is not legal
+    """
+    destination_square = piece._board._board[INDEX[destination]]
+
+    # if a friendly piece is blocking the move
+    if destination_square is not None:
+        if piece._owner is destination_square._owner:
+            return False
+
+    return (source, destination) in PALACE_MOVES
+
+
+def line_move_path(source, destination):
+    """
+    Returns the squares traversed by a Chariot or a Cannon while
+    making the specified move. Both pieces move along the same lines,
+    and the squares of each of those moves are looked up in the
+    LINE_SQUARES table, which is built once when the module is loaded.
+    The tuple from the table is returned as is, without being copied.
+
+    :param source: string - algebraic notation for a location
+                            on the board
+    :param destination: string - algebraic notation for a location
+                                 on the board
+    :return: Tuple containing squares on the board (in algebraic
+             notation) that the piece will traverse during move.
+             Returns an empty tuple if there are no intermediate
+             squares on the move.
+    """
+    return LINE_SQUARES.get((source, destination), Piece._EMPTY_PATH)
+
 
 class JanggiGame:
     """
@@ -23,19 +418,24 @@ class JanggiGame:
     game state, and return whether a specified player is in check.
     """
 
+    __slots__ = ("_blue", "_red", "_players", "_board", "_game_state",
+                 "_turn")
+
     def __init__(self):
         """
         Constructs a JanggiGame object and creates two player objects
         (blue and red), a game board object and initializes,
         sets the game state to 'UNFINISHED', ands sets the current
-        player to blue.
+        player to blue. The current player is stored as an index
+        (_turn) into the tuple of players: 0 for blue, 1 for red.
         """
         self._blue = Player("blue")
         self._red = Player("red")
+        self._players = (self._blue, self._red)
         self._board = Board(self)
         self._board.initialize_board()
         self._game_state = "UNFINISHED"
-        self._current_player = self._blue
+        self._turn = 0
 
     def get_blue(self):
         """
@@ -105,7 +505,7 @@ class JanggiGame:
         Used by self.make_move() and various methods of the Board class.
         :return: Player object referenced by self._blue or self._red
         """
-        return self._current_player
+        return self._players[self._turn]
 
     def set_current_player(self, player):
         """
@@ -116,20 +516,18 @@ class JanggiGame:
         :param player: Player object self._blue or self._red
         :return: None
         """
-        self._current_player = player
+        self._turn = self._players.index(player)
 
     def toggle_players(self):
         """
-        Determines who is the current player and switches to the other
-        player. Takes no arguments and returns None.
+        Switches the current player to the other player by flipping
+        the turn index between 0 and 1. Takes no arguments and
+        returns None.
         Used by self.make_move.
 
         :return: None
         """
-        if self.get_current_player() is self.get_blue():
-            self.set_current_player(self.get_red())
-        else:
-            self.set_current_player(self.get_blue())
+        self._turn ^= 1
 
     def is_in_check(self, color):
         """
@@ -137,15 +535,17 @@ class JanggiGame:
         is implemented by calling Board.is_in_check() and passing it a
         a player object. self.is_in_check determines which player
         object to pass by decoding the string parameter passed to it.
+        Kept for users of the game; make_move passes the current
+        player object to Board.is_in_check directly.
 
         :param color:   string: 'red' or 'blue'
         :return:    True if the given player is in check, or
                     False if the given player is not in check.
         """
         if color == 'blue':
-            return self.get_board().is_in_check(self.get_blue())
+            return self._board.is_in_check(self._blue)
         else:
-            return self.get_board().is_in_check(self.get_red())
+            return self._board.is_in_check(self._red)
 
     def make_move(self, source, destination):
         """
@@ -171,13 +571,17 @@ class JanggiGame:
         # print(f"game.make_move('{source}', '{destination}')")
 
         # check and handle game already over
-        if self.get_game_state() != "UNFINISHED":
+        if self._game_state != "UNFINISHED":
             return False
 
+        # store variables for use throughout method
+        board = self._board
+        current_player = self._players[self._turn]
+
         # check and handle player passing turn
         if source == destination:
             # if passing player is in check, move is not allowed
-            if self.is_in_check(self.get_current_player().get_color()):
+            if board.is_in_check(current_player):
                 return False
             # otherwise, toggle players and return true
             else:
@@ -185,24 +589,24 @@ class JanggiGame:
                 return True
 
         # check and handle no piece on source square
-        if self.get_board().get_occupant(source) is None:
+        source_piece = board._board[INDEX[source]]
+        if source_piece is None:
             return False
 
         # check and handle wrong player attempting to move
-        if (self.get_board().get_occupant(source).get_owner()
-                is not self.get_current_player()):
+        if source_piece._owner is not current_player:
             return False
 
         # check if the requested move is legal
-        if self.get_board().is_legal(source, destination):
+        if board.is_legal(source, destination):
             # if the move is legal, move the piece
-            self.get_board().move_piece(source, destination)
+            board.move_piece(source, destination)
             # toggle players and check for checkmate
             self.toggle_players()
             # if the newly current player is in checkmate,
             # the other player has won
-            if self.get_board().is_in_checkmate(self.get_current_player()):
-                if self.get_current_player() is self.get_blue():
+            if board.is_in_checkmate(self._players[self._turn]):
+                if current_player is self._red:
                     self.set_game_state("RED_WON")
                 else:
                     self.set_game_state("BLUE_WON")
@@ -222,17 +626,22 @@ class Player:
     get the player's General piece object, and get the player's color.
     """
 
+    __slots__ = ("_color", "_cart", "_general")
+
     def __init__(self, color):
         """
         Constructs a Player object and initializes variables. A Player
         object is created by a JanggiGame object which assigns it the
         color 'blue' or 'red'. The player's cart is initialized as
-        an empty list to which Piece objects are added and removed.
+        an empty set to which Piece objects are added and removed.
+        The player's General is kept in _general as it is added to the
+        cart so that it does not need to be searched for.
 
         :param color:   string: 'blue' or 'red'
         """
         self._color = color
-        self._cart = []
+        self._cart = set()
+        self._general = None
 
     def __repr__(self):
         """
@@ -255,10 +664,10 @@ class Player:
 
     def get_cart(self):
         """
-        Returns a list containing all of the piece objects that are
+        Returns a set containing all of the piece objects that are
         in the player's holdings. Used by the Board class for
         evaluating check and checkmate scenarios.
-        :return: list containing Piece objects belonging to the player.
+        :return: set containing Piece objects belonging to the player.
         """
         return self._cart
 
@@ -270,7 +679,9 @@ class Player:
         :param piece: Piece object
         :return: None
         """
-        self._cart.append(piece)
+        self._cart.add(piece)
+        if piece.get_name() == "GN":  # "GN" specifies a General
+            self._general = piece
 
     def remove_piece(self, piece):
         """
@@ -280,23 +691,19 @@ class Player:
         :param piece: Piece object
         :return: None
         """
-        if piece in self.get_cart():
-            self._cart.remove(piece)
+        self._cart.discard(piece)
+        if piece is self._general:
+            self._general = None
 
     def get_general(self):
         """
         Returns the General object belonging to the player. Used by
         the Board class for evaluating check and checkmate scenarios.
 
-        :return: General object
+        :return: General object, or None if the General is not
+                 in the player's cart
         """
-        general = None
-
-        for piece in self.get_cart():
-            if piece.get_name() == "GN":  # "GN" specifies a General
-                general = piece
-
-        return general
+        return self._general
 
 
 class Board:
@@ -314,18 +721,29 @@ class Board:
     calls methods in the Piece classes to evaluate legal moves
     for each piece and provide a list of spaces that a piece will
     move through on a given move.
-    The game board is implemented as a list of lists, where each
-    sublist represents a row on the board and each element in the
-    sublist represents a column in that row. A space which is
-    occupied contains a Piece object and an empty space contains
-    the value None. Addressing of the board within in the Board class
-    and between the Board and the Piece classes is communicated
-    as indexes of the list of lists. There is a decode_location
-    function and an encode_location function that translate the
-    strings containing algebraic notation (i.e. 'a1') to and from
-    row and column notation (i.e. (0,0)).
+    The game board is implemented as a flat list of 90 squares, where
+    the square at a given row and column is stored at the index
+    row * 9 + column. A space which is occupied contains a Piece object
+    and an empty space contains the value None. Addressing of the board
+    within in the Board class and between the Board and the Piece
+    classes is communicated as rows and columns which are converted
+    to indexes of the flat list. The DECODE and ENCODE tables
+    translate the strings containing algebraic notation (i.e. 'a1')
+    to and from row and column notation (i.e. (0,0)); the
+    decode_location and encode_location methods are kept as
+    wrappers around them for callers outside this module.
+    Alongside the list, the Board keeps bitboards--integers with one bit
+    per square--recording which squares are occupied by each player,
+    by either player and by each type of piece. The bitboards are
+    updated whenever a piece is moved and are used to quickly find
+    the pieces that may be attacking a square.
     """
 
+    __slots__ = ("_game", "_board", "_occ", "_occ_all", "_piece_bb",
+                 "_temp", "_in_temp", "_pinned", "_attacks",
+                 "_attacks_union", "_hash", "_tt_check", "_tt_checkmate",
+                 "_highlight", "_dirty")
+
     def __init__(self, game):
         """
         Constructs a Board object and initializes variables.
@@ -334,16 +752,29 @@ class Board:
         game.get_current_player method for use in the
         board.is_legal method. Also creates a variable _board that
         holds the game board.
-        _board is initialized to an empty list and there is an
-        initialize_board method to populate the board with the
-        opening setup.
+        _board is initialized to a list of 90 empty squares and there
+        is an initialize_board method to populate the board with the
+        opening setup. _occ holds an occupancy bitboard for each player,
+        _occ_all holds one for both players together and _piece_bb
+        holds a bitboard for each type of piece.
 
         :param game: a JanggiGame object
         """
         self._game = game
-        self._board = []
+        self._board = [None] * 90
+        self._occ = {}
+        self._occ_all = 0
+        self._piece_bb = {}
         self._temp = None  # temporary storage for undoing move
+        self._in_temp = 0  # number of temporary moves in progress
+        self._pinned = {}  # pinned squares for each player
+        self._attacks = {}  # squares each piece can move to
+        self._attacks_union = {}  # squares each player can move to
+        self._hash = 0  # Zobrist hash of the position
+        self._tt_check = {}  # is_in_check results by position
+        self._tt_checkmate = {}  # is_in_checkmate results by position
         self._highlight = None
+        self._dirty = set(range(90))  # squares to redraw in draw_board
 
     def __repr__(self):
         """
@@ -363,150 +794,183 @@ class Board:
         game and None is assigned to any empty spaces. The board
         is created by using row, column notation and any strings
         containing algebraic notation will have to be converted.
-        After creating the game board, piece objects are also
-        added to their respective player's cart.
+        As each piece object is created it is also added to its
+        player's cart and recorded on the bitboards.
 
         :return: None
         """
         red = self.get_game().get_red()
         blue = self.get_game().get_blue()
 
+        # clear the bitboards, the pinned squares and the attacks
+        self._occ = {blue: 0, red: 0}
+        self._occ_all = 0
+        self._piece_bb = {name: 0 for name in ATTACK_MASKS}
+        self._pinned = {}
+        self._attacks = {}
+        self._attacks_union = {}
+        self._hash = 0
+        self._tt_check = {}
+        self._tt_checkmate = {}
+        self._dirty = set(range(90))
+
+        def place(piece_class, name, location, owner):
+            """
+            Creates a piece, adds it to its owner's cart and records
+            it on the bitboards.
+
+            :return: the new Piece object
+            """
+            piece = piece_class(name, location, owner, self)
+            owner.add_piece(piece)
+            row, column = DECODE[location]
+            self._occ[owner] |= 1 << (row * 9 + column)
+            self._occ_all |= 1 << (row * 9 + column)
+            self._piece_bb[name] |= 1 << (row * 9 + column)
+            self._hash ^= ZOBRIST[name][owner.get_color()][row * 9 + column]
+            return piece
+
         self._board = [
-            [
-                Chariot("CH", "a1", red, self),
-                Elephant("EL", "b1", red, self),
-                Horse("HO", "c1", red, self),
-                Guard("GD", "d1", red, self),
-                None,
-                Guard("GD", "f1", red, self),
-                Elephant("EL", "g1", red, self),
-                Horse("HO", "h1", red, self),
-                Chariot("CH", "i1", red, self)
-            ],
-            [
-                None, None, None, None,
-                General("GN", "e2", red, self),
-                None, None, None, None
-            ],
-            [
-                None, Cannon("CA", "b3", red, self),
-                None, None, None, None, None,
-                Cannon("CA", "h3", red, self), None
-            ],
-            [
-                Soldier("SD", "a4", red, self), None,
-                Soldier("SD", "c4", red, self), None,
-                Soldier("SD", "e4", red, self), None,
-                Soldier("SD", "g4", red, self), None,
-                Soldier("SD", "i4", red, self)
-            ],
-            [
-                None, None, None, None, None, None, None, None, None
-            ],
-            [
-                None, None, None, None, None, None, None, None, None
-            ],
-            [
-                Soldier("SD", "a7", blue, self), None,
-                Soldier("SD", "c7", blue, self), None,
-                Soldier("SD", "e7", blue, self), None,
-                Soldier("SD", "g7", blue, self), None,
-                Soldier("SD", "i7", blue, self)
-            ],
-            [
-                None, Cannon("CA", "b8", blue, self),
-                None, None, None, None, None,
-                Cannon("CA", "h8", blue, self), None
-            ],
-            [
-                None, None, None, None,
-                General("GN", "e9", blue, self),
-                None, None, None, None
-            ],
-            [
-                Chariot("CH", "a10", blue, self),
-                Elephant("EL", "b10", blue, self),
-                Horse("HO", "c10", blue, self),
-                Guard("GD", "d10", blue, self),
-                None,
-                Guard("GD", "f10", blue, self),
-                Elephant("EL", "g10", blue, self),
-                Horse("HO", "h10", blue, self),
-                Chariot("CH", "i10", blue, self)
-            ]
+            # row 1
+            place(Chariot, "CH", "a1", red),
+            place(Elephant, "EL", "b1", red),
+            place(Horse, "HO", "c1", red),
+            place(Guard, "GD", "d1", red),
+            None,
+            place(Guard, "GD", "f1", red),
+            place(Elephant, "EL", "g1", red),
+            place(Horse, "HO", "h1", red),
+            place(Chariot, "CH", "i1", red),
+            # row 2
+            None, None, None, None,
+            place(General, "GN", "e2", red),
+            None, None, None, None,
+            # row 3
+            None, place(Cannon, "CA", "b3", red),
+            None, None, None, None, None,
+            place(Cannon, "CA", "h3", red), None,
+            # row 4
+            place(Soldier, "SD", "a4", red), None,
+            place(Soldier, "SD", "c4", red), None,
+            place(Soldier, "SD", "e4", red), None,
+            place(Soldier, "SD", "g4", red), None,
+            place(Soldier, "SD", "i4", red),
+            # row 5
+            None, None, None, None, None, None, None, None, None,
+            # row 6
+            None, None, None, None, None, None, None, None, None,
+            # row 7
+            place(Soldier, "SD", "a7", blue), None,
+            place(Soldier, "SD", "c7", blue), None,
+            place(Soldier, "SD", "e7", blue), None,
+            place(Soldier, "SD", "g7", blue), None,
+            place(Soldier, "SD", "i7", blue),
+            # row 8
+            None, place(Cannon, "CA", "b8", blue),
+            None, None, None, None, None,
+            place(Cannon, "CA", "h8", blue), None,
+            # row 9
+            None, None, None, None,
+            place(General, "GN", "e9", blue),
+            None, None, None, None,
+            # row 10
+            place(Chariot, "CH", "a10", blue),
+            place(Elephant, "EL", "b10", blue),
+            place(Horse, "HO", "c10", blue),
+            place(Guard, "GD", "d10", blue),
+            None,
+            place(Guard, "GD", "f10", blue),
+            place(Elephant, "EL", "g10", blue),
+            place(Horse, "HO", "h10", blue),
+            place(Chariot, "CH", "i10", blue)
         ]
 
-        # add pieces to respective players' carts
-        board = self.get_board()
-        for row in range(len(board)):
-
-            for column in range(len(board[row])):
-                piece = board[row][column]
-
-                if piece is not None:
-                    if piece.get_owner() is blue:
-                        blue.add_piece(piece)  # add to blue's cart
-                    else:
-                        red.add_piece(piece)  # add to red's cart
+        # record the squares each piece can move to
+        for piece in self._board:
+            if piece is not None:
+                self._attacks[piece] = self.find_attacks(piece)
+        self.update_attacks_union()
 
     def print_board(self):
         """
         Used for debugging purposes.
         Prints the game board to the console screen.
-        Each sublist is printed directly to the screen, so piece
+        Each row is printed directly to the screen, so piece
         abbreviations must match the number of characters in None
         so that columns will line up with each other.
 
         :return: None
         """
+        board = self._board
         print("     a     b     c     d     e     f     g     h     i")
 
-        for i in range(len(self.get_board()) - 1):
-            print(f" {i + 1}", self.get_board()[i])
+        for i in range(9):
+            print(f" {i + 1}", board[i * 9:i * 9 + 9])
 
-        print("10", self.get_board()[9])
+        print("10", board[81:90])
 
-    def draw_board(self, window):
+    def draw_board(self, window, background=None):
         """
         Used by the game interface to draw the game board.
-        Loads a piece image for each piece on the board
+        Loads a piece image for each piece on the board (images are
+        cached after the first time they are loaded)
         and writes them to the display. If highlight contains
         a piece location, then load and display the highlighted
         image for that piece.
+        If the background image of the board is passed, only the
+        squares that changed since the last call (the squares of a
+        move and of a highlight that was set or cleared) are drawn:
+        each one is covered with its part of the background before
+        its piece is drawn. Otherwise every piece is drawn onto a
+        window that already shows the background.
+        Raises RuntimeError if JANGGI_HEADLESS is set, since pygame
+        is then not imported.
 
         :param window: Display window from pygame
-        :param highlight: string - algebraic notation of piece
-                          to highlight
-        :return: None
-        """
-        board = self.get_board()
-        for row in range(len(board)):
-            for col in range(len(board[row])):
-                piece = board[row][col]
-                # draw the image for the piece
-                if piece is None:
-                    continue
-                else:
-                    image = pygame.image.load(piece.get_image())
-                    location = piece.get_location()
-                    x, y = self.get_xy_from_algebraic(location)
-                    window.blit(image, (x, y))
-
-        # draw the highlighted piece
-        highlight = self.get_highlight()
-        if highlight is not None:
-            piece = self.get_occupant(highlight)
-            if piece is not None:  # if not empty square
-                image = pygame.image.load(piece.get_image_highlight())
-                x, y = self.get_xy_from_algebraic(highlight)
+        :param background: Surface - background image of the board,
+                           or None to draw every piece
+        :return: list of pygame Rects of the squares that were drawn
+        """
+        if HEADLESS:
+            raise RuntimeError("draw_board requires pygame "
+                               "(JANGGI_HEADLESS is set)")
+        board = self._board
+        highlight = self._highlight
+        if background is None:
+            squares = range(90)
+        else:
+            squares = self._dirty
+        rects = []
+
+        for index in squares:
+            piece = board[index]
+            if piece is None and background is None:
+                continue
+            x, y = SQUARE_XY[index]
+
+            # cover the square with its part of the background
+            if background is not None:
+                window.blit(background, (x, y), BACKGROUND_AREAS[index])
+            rects.append(SQUARE_RECTS[index])
+
+            # draw the image for the piece
+            if piece is None:
+                continue
+            window.blit(load_image(piece.get_image()), (x, y))
+            # draw the highlighted piece
+            if piece._location == highlight:
+                image = load_image(piece.get_image_highlight())
                 window.blit(image, (x, y))
 
+        self._dirty.clear()
+        return rects
+
     def get_board(self):
         """
         Returns the _board data member of the board object.
         Used by Piece objects for determining legal moves.
 
-        :return: self._board - a list of lists representing
+        :return: self._board - a flat list of 90 squares representing
                                 the game board
         """
         return self._board
@@ -560,7 +1024,9 @@ class Board:
                          of piece to highlight
         :return: None
         """
+        self.mark_dirty(self._highlight)
         self._highlight = location
+        self.mark_dirty(location)
 
     def clear_highlight(self):
         """
@@ -570,8 +1036,21 @@ class Board:
 
         :return: None
         """
+        self.mark_dirty(self._highlight)
         self._highlight = None
 
+    def mark_dirty(self, location):
+        """
+        Records that a square must be drawn again by draw_board.
+
+        :param location: string - algebraic notation for a location
+                         on the board, or None
+        :return: None
+        """
+        if location in DECODE:
+            row, column = DECODE[location]
+            self._dirty.add(row * 9 + column)
+
     def prep_temp_move(self, destination):
         """
         Stores the piece at the destination square in preparation
@@ -583,13 +1062,18 @@ class Board:
         to before the temporary move
         4) call undo_temp_move to put the pieces back where they were
         before the temporary move.
+        prep_temp_move and undo_temp_move keep the captured piece in
+        _temp, so only one such move can be made at a time. The engine
+        itself uses _make and _unmake, which pass the captured piece
+        along and can be nested.
 
         :param destination: string - algebraic notation for a location
             on the board, determines the piece to save for restoration
         :return: None
         """
-        row, column = self.decode_location(destination)
-        self.set_temp(self.get_board()[row][column])
+        row, column = DECODE[destination]
+        self.set_temp(self._board[row * 9 + column])
+        self._in_temp += 1
 
     def undo_temp_move(self, source, destination):
         """
@@ -610,24 +1094,18 @@ class Board:
         :return: None
         """
         # set up variables
-        board = self.get_board()
         temp_piece = self.get_temp()
-        source_row, source_column = self.decode_location(source)
-        dest_row, dest_column = self.decode_location(destination)
 
-        # restore piece back to source
-        board[source_row][source_column] = board[dest_row][dest_column]
-        board[source_row][source_column].set_location(source)
-
-        # restore piece to destination (restores to empty square
-        # if there was no piece there originally)
-        board[dest_row][dest_column] = temp_piece
+        # restore piece back to source and restore piece to destination
+        # (restores to empty square if there was no piece there originally)
+        self._unmake(INDEX[source], INDEX[destination], temp_piece)
         # if there was a piece to restore:
         if temp_piece is not None:
             # add piece back to owner's cart
-            temp_piece.get_owner().add_piece(temp_piece)
+            temp_piece._owner.add_piece(temp_piece)
         # empty temporary piece storage
         self.set_temp(None)
+        self._in_temp -= 1
 
     def get_occupant(self, location):
         """
@@ -638,8 +1116,7 @@ class Board:
                                     on the board
         :return: Piece object located on the given location
         """
-        row, column = self.decode_location(location)
-        return self.get_board()[row][column]
+        return self._board[INDEX[location]]
 
     def move_piece(self, source, destination):
         """
@@ -655,30 +1132,314 @@ class Board:
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: None
+        :return: the Piece object captured on the destination,
+                 or None if the destination was empty
         """
-        board = self.get_board()
-        blue = self.get_game().get_blue()
-        red = self.get_game().get_red()
-        source_row, source_column = self.decode_location(source)
-        dest_row, dest_column = self.decode_location(destination)
-        source_piece = board[source_row][source_column]
-        dest_piece = board[dest_row][dest_column]
+        blue = self._game._blue
+        red = self._game._red
+        source_index = INDEX[source]
+        dest_index = INDEX[destination]
+
+        # the piece on the source is moved to the destination,
+        # the piece's location is updated,
+        # and the piece is removed from the source
+        dest_piece = self._make(source_index, dest_index)
 
-        # if the destination square is occupied, that piece is captured
+        # if the destination square was occupied, that piece is captured
         # and removed from the owner's cart
         if dest_piece is not None:
-            if dest_piece.get_owner() is blue:
+            if dest_piece._owner is blue:
                 blue.remove_piece(dest_piece)
             else:
                 red.remove_piece(dest_piece)
 
-        # the piece on the source is moved to the destination,
-        # the piece's location is updated,
-        # and the piece is removed from the source
-        board[dest_row][dest_column] = source_piece
-        source_piece.set_location(destination)
-        board[source_row][source_column] = None
+        # a real move changes which squares are pinned, attacked and drawn.
+        # a temporary move is always undone, so they are kept.
+        if not self._in_temp:
+            self._pinned = {}
+            self._dirty.add(source_index)
+            self._dirty.add(dest_index)
+            self.refresh_attacks(source_index, dest_index, dest_piece)
+
+        return dest_piece
+
+    def find_attacks(self, piece):
+        """
+        Finds every square that a piece can make a legal move to from
+        its current location. Other than for a Cannon, the squares are
+        checked in one pass over LEGAL_DEST against the occupancy
+        bitboards, the same tests as Piece._can_attack without a
+        method call per square. A Cannon is asked about each square in
+        the attack mask for its type.
+
+        :param piece: Piece object to evaluate
+        :return: frozenset of the indexes of the squares the piece
+                 can move to
+        """
+        row, column = piece._rc
+        source_index = row * 9 + column
+        name = piece._name
+
+        if name != "CA":
+            friendly = self._occ[piece._owner]
+            occupied = self._occ_all
+            paths = MOVE_PATH[name]
+            return frozenset(
+                target for target in
+                LEGAL_DEST[name][piece._owner._color][source_index]
+                if not friendly >> target & 1
+                and not occupied & paths[(source_index, target)]
+            )
+
+        mask = ATTACK_MASKS[name][source_index]
+        targets = set()
+
+        while mask:
+            bit = mask & -mask  # lowest set bit
+            target = bit.bit_length() - 1
+            if piece._can_attack(target):
+                targets.add(target)
+            mask ^= bit
+
+        return frozenset(targets)
+
+    def refresh_attacks(self, source_index, dest_index, captured):
+        """
+        Updates the squares attacked by each piece after a real move.
+        The captured piece (if any) is dropped, the moved piece is
+        recalculated, and so is every piece whose moves could depend
+        on the source or destination square: a piece that could move
+        to or through either square (a Horse's or Elephant's leg, or
+        a square on a Chariot's or Cannon's line).
+
+        :param source_index: int - index of the square moved from
+        :param dest_index: int - index of the square moved to
+        :param captured: Piece object captured by the move, or None
+        :return: None
+        """
+        changed = (1 << source_index) | (1 << dest_index)
+        attacks = self._attacks
+
+        if captured is not None:
+            del attacks[captured]
+
+        for piece in attacks:
+            row, column = piece._rc
+            index = row * 9 + column
+            name = piece._name
+            reach = ATTACK_MASKS[name][index]
+            if name == "HO":  # a Horse's leg is next to it
+                reach |= ATTACK_MASKS["GN"][index]
+            elif name == "EL":  # an Elephant's legs are within a Horse move
+                reach |= ATTACK_MASKS["GN"][index] | ATTACK_MASKS["HO"][index]
+
+            if index == dest_index or reach & changed:
+                attacks[piece] = self.find_attacks(piece)
+
+        self.update_attacks_union()
+
+    def update_attacks_union(self):
+        """
+        Combines the squares attacked by each of a player's pieces
+        into a single set for each player. Used by is_in_check.
+
+        :return: None
+        """
+        blue = self._game._blue
+        red = self._game._red
+        union = {blue: set(), red: set()}
+
+        for piece in self._attacks:
+            union[piece._owner].update(self._attacks[piece])
+
+        self._attacks_union = {
+            blue: frozenset(union[blue]),
+            red: frozenset(union[red])
+        }
+
+    def _make(self, source_index, dest_index):
+        """
+        Moves the piece at one index of the game board to another and
+        updates the piece's location, the bitboards and the hash of
+        the position. The players'
+        carts are not changed, which makes _make and _unmake a cheap
+        way to try out a move: a captured piece is taken off the
+        bitboards, so it is no longer found by any_attacker, and is
+        returned so that _unmake can put it back.
+
+        :param source_index: int - index of the square moved from
+        :param dest_index: int - index of the square moved to
+        :return: the Piece object captured on the destination,
+                 or None if the destination was empty
+        """
+        board = self._board
+        piece = board[source_index]
+        captured = board[dest_index]
+
+        if captured is not None:
+            self.toggle_bits(captured, 1 << dest_index)
+            self.toggle_hash(captured, dest_index)
+
+        board[dest_index] = piece
+        board[source_index] = None
+        piece.set_location(ENCODE[divmod(dest_index, 9)])
+        self.toggle_bits(piece, (1 << source_index) | (1 << dest_index))
+        self.toggle_hash(piece, source_index, dest_index)
+
+        return captured
+
+    def _unmake(self, source_index, dest_index, captured):
+        """
+        Reverses a move made by _make, moving the piece back to the
+        source index and restoring the captured piece (or None) to
+        the destination index.
+
+        :param source_index: int - index of the square moved from
+        :param dest_index: int - index of the square moved to
+        :param captured: the Piece object returned by _make
+        :return: None
+        """
+        board = self._board
+        piece = board[dest_index]
+
+        board[source_index] = piece
+        board[dest_index] = captured
+        piece.set_location(ENCODE[divmod(source_index, 9)])
+        self.toggle_bits(piece, (1 << source_index) | (1 << dest_index))
+        self.toggle_hash(piece, source_index, dest_index)
+
+        if captured is not None:
+            self.toggle_bits(captured, 1 << dest_index)
+            self.toggle_hash(captured, dest_index)
+
+    def toggle_bits(self, piece, bits):
+        """
+        Flips the given bits on the bitboards of the piece's owner, of
+        both players and of the piece's type. Used by _make and _unmake to
+        keep the bitboards in step with the game board: flipping the
+        bits of a piece's source and destination moves it, and
+        flipping the bit of a single square adds or removes it.
+
+        :param piece: Piece object whose bitboards are updated
+        :param bits: int - mask of the squares to flip
+        :return: None
+        """
+        self._occ[piece._owner] ^= bits
+        self._occ_all ^= bits
+        self._piece_bb[piece._name] ^= bits
+
+    def get_pinned_squares(self, player):
+        """
+        Returns the squares on which moving a piece (either
+        away from the square or onto it) might put the given player
+        in check. These are the squares that an opposing Chariot,
+        Cannon, Horse or Elephant passes through on its way to the
+        player's General--moving a piece that blocks the path, or
+        giving a Cannon a piece to jump over, can uncover an attack.
+        A move by any piece other than the General that neither starts
+        nor ends on one of these squares cannot put the player in check.
+        The squares are calculated once per position, as a mask of
+        indexes of the game board, and stored in _pinned until the
+        next real move.
+
+        :param player: Player object whose General is evaluated
+        :return: int - mask of the squares, or None if the player is
+                 already in check or a temporary move is in progress
+                 (every move must then be checked)
+        """
+        if self._in_temp:
+            return None
+
+        if player not in self._pinned:
+            if player._color == 'blue':
+                opponent = self._game._red
+            else:
+                opponent = self._game._blue
+
+            if self.is_in_check(player):
+                pinned = None
+            else:
+                pinned = 0
+                row, column = player._general._rc
+                index = row * 9 + column
+                for name, paths in [("CH", LINE_PATHS), ("CA", LINE_PATHS),
+                                    ("HO", LEG_MASKS["HO"]),
+                                    ("EL", LEG_MASKS["EL"])]:
+                    candidates = (self._occ[opponent] & self._piece_bb[name]
+                                  & ATTACK_MASKS[name][index])
+                    while candidates:
+                        bit = candidates & -candidates  # lowest set bit
+                        # the squares the piece passes through on its
+                        # way to the General
+                        pinned |= paths.get(
+                            (bit.bit_length() - 1, index), 0)
+                        candidates ^= bit
+            self._pinned[player] = pinned
+
+        return self._pinned[player]
+
+    def toggle_hash(self, piece, *indexes):
+        """
+        XORs the Zobrist keys of a piece on the given squares into the
+        hash of the position. Toggling a piece's key on a single square
+        adds or removes it; toggling it on its source and destination
+        moves it.
+
+        :param piece: Piece object being added, removed or moved
+        :param indexes: int - indexes of the squares to toggle
+        :return: None
+        """
+        keys = ZOBRIST[piece._name][piece._owner._color]
+        for index in indexes:
+            self._hash ^= keys[index]
+
+    def remember(self, table, key, value):
+        """
+        Stores a result in a transposition table. When the table is
+        full, the least recently used entry is discarded to make room.
+
+        :param table: dictionary - self._tt_check or self._tt_checkmate
+        :param key: the position (and player) the result belongs to
+        :param value: the result to store
+        :return: None
+        """
+        if len(table) >= TABLE_SIZE:
+            del table[next(iter(table))]  # dictionaries keep insertion order
+        table[key] = value
+
+    def any_attacker(self, location, player):
+        """
+        Determines whether any of a given player's pieces can make a
+        legal move to a given location. Rather than asking every piece
+        in the player's cart, the player's bitboard is combined with
+        the bitboard for each type of piece and the attack mask for
+        the location, which leaves only the pieces that are in a
+        position to reach the location. Only those pieces are asked
+        if they can legally move there, in the order of ATTACK_ORDER,
+        and the search stops at the first one that can.
+
+        :param location: string - algebraic notation for a location
+                                  on the board
+        :param player: Player object whose pieces are the attackers
+        :return: True if one of the player's pieces can move to the
+                 location
+                 False otherwise
+        """
+        board = self._board
+        index = INDEX[location]
+        occupied = self._occ[player]
+
+        for name in ATTACK_ORDER:
+            candidates = (occupied & self._piece_bb[name]
+                          & ATTACK_MASKS[name][index])
+            while candidates:
+                bit = candidates & -candidates  # lowest set bit
+                piece = board[bit.bit_length() - 1]
+                if piece._can_attack(index):
+                    return True
+                candidates ^= bit
+
+        return False
 
     def is_legal(self, source, destination):
         """
@@ -687,8 +1448,11 @@ class Board:
         legally move to the destination location then checks if such
         a move puts that player in check (a player may not make a move
         that puts themself in check). To evaluate whether the move
-        puts the player in check, the board state is saved and
-        a temporary move is made so that is_in_check can be called.
+        puts the player in check, a temporary move is made with _make
+        so that is_in_check can be called, and is then reversed
+        with _unmake.
+        The temporary move is skipped for moves that cannot uncover an
+        attack on the player's General (see get_pinned_squares).
 
         :param source: string - algebraic notation for a location
                                 on the board
@@ -698,27 +1462,36 @@ class Board:
                  False if the move is not legal
         """
         # store variables for use throughout method
-        source_row, source_column = self.decode_location(source)
-        source_piece = self.get_board()[source_row][source_column]
-        source_player = source_piece.get_owner()
+        source_index = INDEX[source]
+        dest_index = INDEX[destination]
+        source_piece = self._board[source_index]
+        source_player = source_piece._owner
 
         # ask the piece at the source if the move is a legal move
         # for that type of piece.
 
         # if the move is legal, check if it puts the player into
         # check (making it an illegal move)
-        if source_piece.is_legal(source, destination):
+        if source_piece._can_attack(dest_index):
+
+            # if the move does not involve the General or a pinned
+            # square, it cannot put the player in check
+            pinned = self.get_pinned_squares(source_player)
+            if (pinned is not None
+                    and source_piece is not source_player._general
+                    and not pinned & (1 << source_index | 1 << dest_index)):
+                return True
 
-            self.prep_temp_move(destination)  # store pieces for temp move
-            self.move_piece(source, destination)  # make a temp move
+            # make a temporary move
+            self._in_temp += 1
+            captured = self._make(source_index, dest_index)
 
             # check if this move put the player in check
-            if self.is_in_check(source_player):
-                self.undo_temp_move(source, destination)  # restore game board
-                return False  # is not legal
-            else:
-                self.undo_temp_move(source, destination)  # restore game board
-                return True  # is legal
+            in_check = self.is_in_check(source_player)
+            self._unmake(source_index, dest_index, captured)  # restore board
+            self._in_temp -= 1
+
+            return not in_check  # is legal if not in check
 
         # if the move is not a legal move for the specified piece
         else:
@@ -733,43 +1506,79 @@ class Board:
         which player to evaluate.
         This method finds this player's general and then checks
         to see if any of the opposing player's pieces can make a
-        legal move to capture this player's general.
+        legal move to capture this player's general. Outside of a
+        temporary move this is a lookup in the set of squares that
+        the opposing player attacks; during a temporary move the
+        opposing pieces are asked through any_attacker.
 
         :param player: Player object to evaluate
         :return: True if the player is in check
                  False if the player is not in check
         """
         # find the player's opponent and save as variable
-        if player.get_color() == 'blue':
-            opponent = self.get_game().get_red()
+        game = self._game
+        if player._color == 'blue':
+            opponent = game._red
         else:
-            opponent = self.get_game().get_blue()
+            opponent = game._blue
 
         # find the player's General's location
-        general_location = player.get_general().get_location()
-
-        # for every one of the opponent's pieces,
-        # ask if they can make a legal move from their current location
-        # to the defending general's location
-        for piece in opponent.get_cart():
-            current_location = piece.get_location()
-            if piece.is_legal(current_location, general_location):
-                return True
-
-        # if we make it past the for-loop, the player is not in check
-        return False
+        general = player._general
+        general_location = general._location
+
+        # the attacked squares are only up to date between real moves
+        if not self._in_temp:
+            row, column = general._rc
+            return row * 9 + column in self._attacks_union[opponent]
+
+        # positions reached during temporary moves are often reached
+        # again, so the result is remembered by the hash of the position
+        key = (self._hash, player._color)
+        # a result that is found is stored again as the most recent
+        in_check = self._tt_check.pop(key, None)
+        if in_check is None:
+            # ask if any of the opponent's pieces can make a legal move
+            # from their current location to the defending general's
+            # location
+            in_check = self.any_attacker(general_location, opponent)
+        self.remember(self._tt_check, key, in_check)
+
+        return in_check
 
     def is_in_checkmate(self, player):
         """
         Determines whether a given player is in checkmate. The method
         must be passed a player object. This method is called by
         the JanggiGame object's make_move method.
-        This method creates a list of pieces that are threatening
-        the general, and determines if any of the defending player's
-        pieces can capture or intercept the attacking pieces. The
-        method also stores the game state and makes all legal moves
-        for the defender's general to see if any of those moves get
-        them out of check.
+        Results are remembered in a transposition table by the hash of
+        the position, and new positions are evaluated by
+        evaluate_checkmate.
+
+        :param player: Player object to evaluate
+        :return: True if the player is in checkmate
+                 False if the player is not in checkmate
+        """
+        key = (self._hash, player._color)
+        in_checkmate = self._tt_checkmate.pop(key, None)
+        if in_checkmate is None:
+            in_checkmate = self.evaluate_checkmate(player)
+        self.remember(self._tt_checkmate, key, in_checkmate)
+
+        return in_checkmate
+
+    def evaluate_checkmate(self, player):
+        """
+        Determines whether a given player is in checkmate.
+        The General's own moves are tried first: there are at most
+        eight of them and, when the General can step out of check,
+        no other piece needs to be looked at. Otherwise this method
+        creates a list of pieces that are threatening the general,
+        and determines if any of the defending player's pieces can
+        capture or intercept the attacking pieces. Only the pieces
+        that can move to the square of an attacker or of its path
+        are asked, found in a map of the squares each defending
+        piece can move to. A mask of all of those squares rules out
+        most attackers without looking at the map.
 
         :param player: Player object to evaluate
         :return: True if the player is in checkmate
@@ -780,162 +1589,158 @@ class Board:
             return False
 
         # set up variables for use throughout method
-        if player.get_color() == 'blue':
-            opponent = self.get_game().get_red()
-            palace = ["d8", "d9", "d10", "e8", "e9", "e10", "f8", "f9", "f10"]
+        if player._color == 'blue':
+            opponent = self._game._red
         else:
-            opponent = self.get_game().get_blue()
-            palace = ["d1", "d2", "d3", "e1", "e2", "e3", "f1", "f2", "f3"]
-        general = player.get_general()
-        gen_loc = general.get_location()
+            opponent = self._game._blue
+        general = player._general
+        gen_loc = general._location
         attacker_list = []
 
+        # attempt to move the General out of check to each neighboring
+        # square of its palace that is not taken by a friendly piece
+        row, column = general._rc
+        general_bit = 1 << (row * 9 + column)
+        squares = (GENERAL_NEIGHBORS[player._color][row * 9 + column]
+                   & ~self._occ[player])
+        while squares:
+            bit = squares & -squares  # lowest set bit
+            squares ^= bit
+            index = bit.bit_length() - 1
+            # the square is still attacked after the move by any piece
+            # that attacks it now along a path that does not pass
+            # through the General's square (a Cannon also depends on
+            # the piece it jumps over, so it is left out)
+            if not self._in_temp and self.attacks_past(
+                    opponent, index, general_bit):
+                continue
+            # otherwise is_legal makes a temporary move to see if the
+            # General is still in check
+            if self.is_legal(gen_loc, ENCODE[divmod(index, 9)]):
+                return False
+
         # populate list of opponent pieces that threaten the general
-        for piece in opponent.get_cart():
-            if self.is_legal(piece.get_location(), gen_loc):
+        for piece in opponent._cart:
+            if self.is_legal(piece._location, gen_loc):
                 attacker_list.append(piece)
 
+        # map each square to the defender's pieces that can move there,
+        # leaving aside whether the move leaves the General in check.
+        # only those pieces need to be asked about a capture or block.
+        defenders = {}
+        defended = 0  # mask of the squares in the map
+        for piece in player._cart:
+            if self._in_temp:
+                targets = self.find_attacks(piece)
+            else:
+                targets = self._attacks[piece]
+            for target in targets:
+                defenders.setdefault(target, []).append(piece)
+                defended |= 1 << target
+
         # for each piece in that list
+        gen_index = row * 9 + column
         for attacker in attacker_list:
-            # check if any of the defender's pieces can capture
-            # the threatening piece
-            for piece in player.get_cart():
-                if self.is_legal(
-                    piece.get_location(),
-                    attacker.get_location()
-                ):
-                    return False
-            # check if any of the defender's pieces can block
-            # the threatening piece
-            path = attacker.move_path(attacker.get_location(), gen_loc)
-            for square in path:
-                for piece in player.get_cart():
-                    if self.is_legal(piece.get_location(), square):
+            attacker_row, attacker_column = attacker._rc
+            attacker_index = attacker_row * 9 + attacker_column
+            # the squares a defender can move to in order to capture
+            # or block the threatening piece. a Cannon's path is the
+            # same as a Chariot's making the same move.
+            name = attacker._name
+            if name == "CA":
+                name = "CH"
+            squares = ((1 << attacker_index
+                        | MOVE_PATH[name][(attacker_index, gen_index)])
+                       & defended)
+            # check if any of the defender's pieces can move there
+            while squares:
+                bit = squares & -squares  # lowest set bit
+                squares ^= bit
+                index = bit.bit_length() - 1
+                square = ENCODE[divmod(index, 9)]
+                for piece in defenders[index]:
+                    if self.is_legal(piece._location, square):
                         return False
 
-        # if the threatening pieces cannot be captured nor blocked,
-        # attempt to move the General to move out of check
-        for square in palace:
-            if general.is_legal(gen_loc, square):
-                # make a temporary move to see if the general is out of check
-                self.prep_temp_move(square)
-                self.move_piece(gen_loc, square)
-                if not self.is_in_check(player):
-                    self.undo_temp_move(gen_loc, square)
-                    return False
-                else:
-                    self.undo_temp_move(gen_loc, square)
-
-        # if the General cannot be moved out of check
+        # if the General cannot be moved out of check and the
+        # threatening pieces cannot be captured nor blocked
         return True
 
+    def attacks_past(self, player, index, bits):
+        """
+        Determines from the attacked squares found after the last real
+        move whether one of a player's pieces other than a Cannon
+        attacks a square along a path that avoids the given squares.
+        Such an attack is not affected by pieces moving on or off
+        those squares, so it is used by evaluate_checkmate to rule out
+        an escape for the General without making a temporary move.
+
+        :param player: Player object whose pieces are the attackers
+        :param index: int - index of the attacked square
+        :param bits: int - mask of the squares the path must avoid
+        :return: True if such an attack exists
+                 False otherwise
+        """
+        attacks = self._attacks
+
+        for piece in player._cart:
+            name = piece._name
+            if name == "CA" or index not in attacks[piece]:
+                continue
+            row, column = piece._rc
+            if not MOVE_PATH[name][(row * 9 + column, index)] & bits:
+                return True
+
+        return False
+
     def decode_location(self, location):
         """
         Converts algebraic notation to row/column notation.
         Conversion is necessary for accessing the game board--which is
-        a list of lists--and is accessed by index, starting at (0, 0)
+        a flat list of 90 squares where the square at (row, column)
+        is stored at index row * 9 + column, starting at (0, 0)
         Location in algebraic notation is a string containing the
         column and row in order where column is a letter a-i
         and row is a number 1-10. Example: "b7"
         Location in row/column notation is a tuple (row, column).
-        Row is the index of the row sublist of the board and
-        column is the index of the element in that sublist that
-        represents the column.
-        In the above example, "b7" is converted to (1, 6)
+        Row is the number of the row (0-9) and column is the
+        number of the column (0-8).
+        In the above example, "b7" is converted to (6, 1)
+
+        The conversion is a lookup in the DECODE table, which code
+        inside this module uses directly.
 
         :param location: A string containing the algebraic notation for
                          the square that the piece currently occupies
         :return: (row, column) where row and column are integers
         """
-        column_key = {
-            "a": 0,
-            "b": 1,
-            "c": 2,
-            "d": 3,
-            "e": 4,
-            "f": 5,
-            "g": 6,
-            "h": 7,
-            "i": 8
-        }
-
-        row_key = {
-            "1": 0,
-            "2": 1,
-            "3": 2,
-            "4": 3,
-            "5": 4,
-            "6": 5,
-            "7": 6,
-            "8": 7,
-            "9": 8,
-            "10": 9
-        }
-
-        column = column_key[location[0]]
-
-        if len(location) == 3:
-            row = row_key[location[1:]]
-        else:
-            row = row_key[location[1]]
-
-        return row, column
+        return DECODE[location]
 
     def encode_location(self, row, column):
         """
         Converts row/column notation to algebraic notation.
         Conversion is necessary for accessing the game board--which is
-        a list of lists--and is accessed by index, starting at (0, 0)
+        a flat list of 90 squares where the square at (row, column)
+        is stored at index row * 9 + column, starting at (0, 0)
 
         Location in row/column notation is a tuple (row, column).
-        Row is the index of the row sublist of the board and
-        column is the index of the element in that sublist that
-        represents the column. Example: (6, 1)
+        Row is the number of the row (0-9) and column is the
+        number of the column (0-8). Example: (6, 1)
 
         Location in algebraic notation is a string containing the
         column and row in order where column is a letter a-i
         and row is a number 1-10.
 
         In the above example, (6, 1) is converted to 'b7'
+        The conversion is a lookup in the ENCODE table, which code
+        inside this module uses directly.
 
-
-        :param row: int - index of the sublist of the game board
-                          representing the row
-        :param column: int - index of the element of the row sublist
-                             of the game board representing the column
+        :param row: int - number of the row (0-9)
+        :param column: int - number of the column (0-8)
         :return: location: A string containing the algebraic notation for
                          the square that the piece currently occupies
         """
-        column_key = {
-            0: 'a',
-            1: 'b',
-            2: 'c',
-            3: 'd',
-            4: 'e',
-            5: 'f',
-            6: 'g',
-            7: 'h',
-            8: 'i'
-        }
-
-        row_key = {
-            0: '1',
-            1: '2',
-            2: '3',
-            3: '4',
-            4: '5',
-            5: '6',
-            6: '7',
-            7: '8',
-            8: '9',
-            9: '10'
-        }
-
-        column = column_key[column]
-        row = row_key[row]
-        location = column + row
-
-        return location
+        return ENCODE[(row, column)]
 
     def get_xy_from_algebraic(self, location):
         """
@@ -946,49 +1751,17 @@ class Board:
         Location in (x, y) notation gives the upper-left corner
         of the square denoted by the string. x and y are offset
         based on the location of the game board on the screen.
+        Every square is SQUARE_SIZE pixels wide and high, so x and y
+        are computed from the column letter and the row number.
 
         :param location: A string containing the algebraic notation
                          to convert
         :return: (x_coord, y_coord) where x and y are integers
                          and represent a location on the display
         """
-
-        x_key = {
-            "a": 0,
-            "b": 67,
-            "c": 134,
-            "d": 201,
-            "e": 268,
-            "f": 335,
-            "g": 402,
-            "h": 469,
-            "i": 536
-        }
-
-        y_key = {
-            "1": 0,
-            "2": 67,
-            "3": 134,
-            "4": 201,
-            "5": 268,
-            "6": 335,
-            "7": 402,
-            "8": 469,
-            "9": 536,
-            "10": 603
-        }
-
-        column = x_key[location[0]]
-
-        if len(location) == 3:
-            row = y_key[location[1:]]
-        else:
-            row = y_key[location[1]]
-
-        x_coord = column + BG_X_OFFSET
-        y_coord = row + BG_Y_OFFSET
-
-        return x_coord, y_coord
+        # the row number may have two digits
+        return (SQUARE_SIZE * (ord(location[0]) - 97) + BG_X_OFFSET,
+                SQUARE_SIZE * (int(location[1:]) - 1) + BG_Y_OFFSET)
 
 
 class Piece:
@@ -1007,6 +1780,12 @@ class Piece:
     can determine which piece is their general.
     """
 
+    __slots__ = ("_name", "_location", "_rc", "_owner", "_board")
+
+    # the move path of a piece with no intermediate squares, shared by
+    # every piece
+    _EMPTY_PATH = ()
+
     def __init__(self, name, location, owner, board):
         """
         Constructs a Piece object and initializes variables.
@@ -1020,13 +1799,9 @@ class Piece:
         """
         self._name = name
         self._location = location
+        self._rc = DECODE[location]
         self._owner = owner
         self._board = board
-        self._palace = [
-            "d8", "d9", "d10", "e8", "e9", "e10", "f8", "f9", "f10",
-            "d1", "d2", "d3", "e1", "e2", "e3", "f1", "f2", "f3"
-        ]
-        self._move_path = []
 
     def __repr__(self):
         """
@@ -1053,6 +1828,8 @@ class Piece:
         Returns the location of the piece. The location is given in
         algebraic notation (i.e. 'a1'). Used by other piece objects
         to determine whether they can make a valid move.
+        The location is also cached in row/column notation in _rc so
+        that the piece does not need to decode its own location.
 
         :return: A string containing the algebraic notation representation
                  of the piece object's location
@@ -1069,6 +1846,7 @@ class Piece:
         :return: None
         """
         self._location = location
+        self._rc = DECODE[location]
 
     def get_owner(self):
         """
@@ -1092,11 +1870,12 @@ class Piece:
 
     def get_image(self):
         """
-        Returns the filename for the piece's image.
+        Returns the filename for the piece's image. The filenames for
+        each type of piece are stored once per class in _IMAGES.
 
         :return: string - filename
         """
-        return self._image
+        return self._IMAGES[self._owner._color][0]
 
     def get_image_highlight(self):
         """
@@ -1104,135 +1883,109 @@ class Piece:
 
         :return: string - filename
         """
-        return self._image_highlight
+        return self._IMAGES[self._owner._color][1]
 
     def get_palace(self):
         """
-        Returns the list of locations that are in either palace.
+        Returns the set of locations that are in either palace.
 
-        :return: list containing locations of palace squares
+        :return: frozenset containing locations of palace squares
         """
-        return self._palace
+        return PALACE
 
     def get_move_path(self):
         """
-        Move path holds a list of intermediate squares that a Piece
-        will traverse to get to their destination.
+        Returns the move path of a move with no intermediate squares.
+        The same empty tuple is shared by every piece.
+
+        :return: tuple - _EMPTY_PATH
+        """
+        return self._EMPTY_PATH
 
-        :return: list - self._move_path
+    def _can_attack(self, target_index):
+        """
+        Determines if the piece can legally move from its current
+        location to the square at the given index of the game board.
+        Used inside the engine (by Board.is_legal, Board.any_attacker
+        and Board.find_attacks) so that the target square does not have
+        to be converted to and from algebraic notation.
+        The move is looked up in LEGAL_DEST, the moves the piece could
+        make on an empty board, and is then only blocked by a friendly
+        piece on the destination or by any piece on its MOVE_PATH.
+
+        :param target_index: int - index of the square on the game board
+        :return: True if the move is legal
+                 False if the move is not legal
         """
-        return self._move_path
+        board = self._board
+        destination_piece = board._board[target_index]
+
+        # if a friendly piece is on the destination
+        if destination_piece is not None:
+            if self._owner is destination_piece._owner:
+                return False
+
+        row, column = self._rc
+        source_index = row * 9 + column
+        legal = LEGAL_DEST[self._name][self._owner._color][source_index]
+        if target_index not in legal:  # move is not physically allowed
+            return False
+
+        # if there is any piece blocking the move path
+        return not board._occ_all & MOVE_PATH[self._name][
+            (source_index, target_index)]
 
     def decode_location(self, location):
         """
         Converts algebraic notation to row/column notation.
         Conversion is necessary for accessing the game board--which is
-        a list of lists--and is accessed by index, starting at (0, 0)
+        a flat list of 90 squares where the square at (row, column)
+        is stored at index row * 9 + column, starting at (0, 0)
 
         Location in algebraic notation is a string containing the
         column and row in order where column is a letter a-i
         and row is a number 1-10. Example: 'b7'
 
         Location in row/column notation is a tuple (row, column).
-        Row is the index of the row sublist of the board and
-        column is the index of the element in that sublist that
-        represents the column.
+        Row is the number of the row (0-9) and column is the
+        number of the column (0-8).
 
         In the above example, 'b7' is converted to (6, 1)
 
+        The conversion is a lookup in the DECODE table, which code
+        inside this module uses directly.
+
         :param location: A string containing the algebraic notation for
                          the square that the piece currently occupies
         :return: (row, column) where row and column are integers
         """
-        column_key = {
-            "a": 0,
-            "b": 1,
-            "c": 2,
-            "d": 3,
-            "e": 4,
-            "f": 5,
-            "g": 6,
-            "h": 7,
-            "i": 8
-        }
-
-        row_key = {
-            "1": 0,
-            "2": 1,
-            "3": 2,
-            "4": 3,
-            "5": 4,
-            "6": 5,
-            "7": 6,
-            "8": 7,
-            "9": 8,
-            "10": 9
-        }
-
-        column = column_key[location[0]]
-
-        if len(location) == 3:
-            row = row_key[location[1:]]
-        else:
-            row = row_key[location[1]]
-
-        return row, column
+        return DECODE[location]
 
     def encode_location(self, row, column):
         """
         Converts row/column notation to algebraic notation.
         Conversion is necessary for accessing the game board--which is
-        a list of lists--and is accessed by index, starting at (0, 0)
+        a flat list of 90 squares where the square at (row, column)
+        is stored at index row * 9 + column, starting at (0, 0)
 
         Location in row/column notation is a tuple (row, column).
-        Row is the index of the row sublist of the board and
-        column is the index of the element in that sublist that
-        represents the column. Example: (6, 1)
+        Row is the number of the row (0-9) and column is the
+        number of the column (0-8). Example: (6, 1)
 
         Location in algebraic notation is a string containing the
         column and row in order where column is a letter a-i
         and row is a number 1-10.
 
         In the above example, (6, 1) is converted to 'b7'
+        The conversion is a lookup in the ENCODE table, which code
+        inside this module uses directly.
 
-
-        :param row: int - index of the sublist of the game board
-                          representing the row
-        :param column: int - index of the element of the row sublist
-                             of the game board representing the column
+        :param row: int - number of the row (0-9)
+        :param column: int - number of the column (0-8)
         :return: location: A string containing the algebraic notation for
                          the square that the piece currently occupies
         """
-        column_key = {
-            0: 'a',
-            1: 'b',
-            2: 'c',
-            3: 'd',
-            4: 'e',
-            5: 'f',
-            6: 'g',
-            7: 'h',
-            8: 'i'
-        }
-
-        row_key = {
-            0: '1',
-            1: '2',
-            2: '3',
-            3: '4',
-            4: '5',
-            5: '6',
-            6: '7',
-            7: '8',
-            8: '9',
-            9: '10'
-        }
-
-        column = column_key[column]
-        row = row_key[row]
-        location = column + row
-
-        return location
+        return ENCODE[(row, column)]
 
 
 class General(Piece):
@@ -1243,24 +1996,15 @@ class General(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a General object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_king_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_king_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_king_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_king_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_king_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_king_67x67.png'),
+        'red': ('images/pieces/western/red/red_king_wooden_67x67.png',
+                'images/pieces/western/red/red_king_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
@@ -1278,66 +2022,23 @@ class General(Piece):
         :return: True if the move is legal
                  False if the move is not legal
         """
-        # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_square = game_board[to_row][to_col]
-        destination_location = self.encode_location(to_row, to_col)
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        palace_centers = ['e2', 'e9']
-
-        # if a friendly piece is blocking the move
-        if destination_square is not None:
-            if self.get_owner() is destination_square.get_owner():
-                return False
-
-        # if the destination is not in the palace
-        if destination_location not in self.get_palace():
-            return False
-
-        # cannot move more than 1 square
-        if (abs(to_row - from_row) > 1) or (abs(to_col - from_col) > 1):
-            return False
-
-        # handle diagonal moves
-        if (abs(to_row - from_row) == 1) and (abs(to_col - from_col) == 1):
-            # move from corners to center
-            if source in palace_corners:
-                if destination in palace_centers:
-                    return True
-                else:
-                    return False
-            # move from center to corners
-            elif source in palace_centers:
-                if destination in palace_corners:
-                    return True
-                else:
-                    return False
-            # no other diagonal moves are allowed
-            else:
-                return False
-
-        return True
+        return palace_step_is_legal(self, source, destination)
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
+        Returns the squares traversed while making the specified
+        move. This piece only ever moves one square, so there are no
+        intermediate squares and the shared empty tuple is returned.
+        The method is used by Board.is_in_checkmate to determine
         if a defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
-                 notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
-                 squares on the move.
+        :return: empty tuple
         """
-        return self.get_move_path()  # General has no intermediate moves
+        return self._EMPTY_PATH  # General has no intermediate moves
 
 
 class Guard(Piece):
@@ -1348,24 +2049,15 @@ class Guard(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a Guard object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_advisor_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_advisor_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_advisor_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_advisor_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_advisor_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_advisor_67x67.png'),
+        'red': ('images/pieces/western/red/red_advisor_wooden_67x67.png',
+                'images/pieces/western/red/red_advisor_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
@@ -1383,65 +2075,23 @@ class Guard(Piece):
         :return: True if the move is legal
                  False if the move is not legal
         """
-        # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        palace_centers = ['e2', 'e9']
-
-        # if a friendly piece is blocking the move
-        if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
-                return False
-
-        # if the destination is not in the palace
-        if destination not in self.get_palace():
-            return False
-
-        # cannot move more than 1 square
-        if (abs(to_row - from_row) > 1) or (abs(to_col - from_col) > 1):
-            return False
-
-        # handle diagonal moves
-        if (abs(to_row - from_row) == 1) and (abs(to_col - from_col) == 1):
-            # move from corners to center
-            if source in palace_corners:
-                if destination in palace_centers:
-                    return True
-                else:
-                    return False
-            # move from center to corners
-            elif source in palace_centers:
-                if destination in palace_corners:
-                    return True
-                else:
-                    return False
-            # no other diagonal moves are allowed
-            else:
-                return False
-
-        return True
+        return palace_step_is_legal(self, source, destination)
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
+        Returns the squares traversed while making the specified
+        move. This piece only ever moves one square, so there are no
+        intermediate squares and the shared empty tuple is returned.
+        The method is used by Board.is_in_checkmate to determine
         if a defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
-                 notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
-                 squares on the move.
+        :return: empty tuple
         """
-        return self.get_move_path()  # Guard has no intermediate moves
+        return self._EMPTY_PATH  # Guard has no intermediate moves
 
 
 class Elephant(Piece):
@@ -1452,24 +2102,15 @@ class Elephant(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs an Elephant object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_elephant_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_elephant_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_elephant_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_elephant_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_elephant_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_elephant_67x67.png'),
+        'red': ('images/pieces/western/red/red_elephant_wooden_67x67.png',
+                'images/pieces/western/red/red_elephant_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
@@ -1488,120 +2129,46 @@ class Elephant(Piece):
                  False if the move is not legal
         """
         # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
+        board = self._board  # save the Board object
+        if source == self._location:  # use the cached row and column
+            from_row, from_col = self._rc
+        else:
+            from_row, from_col = DECODE[source]
+        to_row, to_col = DECODE[destination]
+        to_index = to_row * 9 + to_col
+        destination_piece = board._board[to_index]
 
         # if a friendly piece is on the destination
         if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
+            if self._owner is destination_piece._owner:
                 return False
 
-        # handle relational movement logic
-        if (abs(to_row - from_row) == 3) and (abs(to_col - from_col) == 2):
-            for square in self.move_path(source, destination):
-                if self.get_board().get_occupant(square) is not None:
-                    return False
-            return True
-
-        elif (abs(to_row - from_row) == 2) and (abs(to_col - from_col) == 3):
-            for square in self.move_path(source, destination):
-                if self.get_board().get_occupant(square) is not None:
-                    return False
-            return True
-
-        else:  # move is not physically allowed
+        # find the squares of the move path
+        path = LEG_MASKS["EL"].get((from_row * 9 + from_col, to_index))
+        if path is None:  # move is not physically allowed
             return False
 
+        # if there is any piece blocking the move path
+        return not board._occ_all & path
+
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
-        if a defender can intercept an attacker.
+        Returns the squares traversed while making the specified
+        move. The squares of every move are looked up in the LEG_PATHS
+        table, which is built once when the module is loaded. The
+        method is used by Board.is_in_checkmate to determine if a
+        defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
+        :return: Tuple containing squares on the board (in algebraic
                  notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
-                 squares on the move.
+                 Returns an empty tuple if the move is not one that
+                 the piece can make.
         """
-        # set up variables for use throughout method
-        move_path = []
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-
-        # Elephants have 8 possible moves and travel through
-        # 2 different squares to get to those each of those 8 moves.
-        # They move either a) three rows and two columns, or
-        # b) three columns and two rows.
-
-        # if an Elephant moves up three rows, they travel through
-        # the square one up from the start and one diagonal square
-        if (to_row - from_row) == -3:
-            # add the orthogonal square
-            square = self.encode_location(from_row - 1, from_col)
-            move_path.append(square)
-
-            # add the diagonal square
-            if (to_col - from_col) == 2:
-                square = self.encode_location(from_row - 2, from_col + 1)
-                move_path.append(square)
-            else:
-                square = self.encode_location(from_row - 2, from_col - 1)
-                move_path.append(square)
-
-        # if an Elephant moves down three rows, they travel through
-        # the square one down from the start and one diagonal square
-        if (to_row - from_row) == 3:
-            # add the orthogonal square
-            square = self.encode_location(from_row + 1, from_col)
-            move_path.append(square)
-
-            # add the diagonal square
-            if (to_col - from_col) == 2:
-                square = self.encode_location(from_row + 2, from_col + 1)
-                move_path.append(square)
-            else:
-                square = self.encode_location(from_row + 2, from_col - 1)
-                move_path.append(square)
-
-        # if an Elephant moves right three columns, they travel through
-        # the square one right from the start and one diagonal square
-        if (to_col - from_col) == 3:
-            # add the orthogonal square
-            square = self.encode_location(from_row, from_col + 1)
-            move_path.append(square)
-
-            # add the diagonal square
-            if (to_row - from_row) == 2:
-                square = self.encode_location(from_row + 1, from_col + 2)
-                move_path.append(square)
-            else:
-                square = self.encode_location(from_row - 1, from_col + 2)
-                move_path.append(square)
-
-        # if an Elephant moves left three columns, they travel through
-        # the square one left from the start and one diagonal square
-        if (to_col - from_col) == -3:
-            # add the orthogonal square
-            square = self.encode_location(from_row, from_col - 1)
-            move_path.append(square)
-
-            # add the diagonal square
-            if (to_row - from_row) == 2:
-                square = self.encode_location(from_row + 1, from_col - 2)
-                move_path.append(square)
-            else:
-                square = self.encode_location(from_row - 1, from_col - 2)
-                move_path.append(square)
-
-        return move_path
+        return LEG_PATHS["EL"].get((source, destination), ())
 
 
 class Horse(Piece):
@@ -1612,24 +2179,15 @@ class Horse(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a Horse object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_horse_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_horse_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_horse_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_horse_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_horse_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_horse_67x67.png'),
+        'red': ('images/pieces/western/red/red_horse_wooden_67x67.png',
+                'images/pieces/western/red/red_horse_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
@@ -1648,85 +2206,46 @@ class Horse(Piece):
                  False if the move is not legal
         """
         # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
+        board = self._board  # save the Board object
+        if source == self._location:  # use the cached row and column
+            from_row, from_col = self._rc
+        else:
+            from_row, from_col = DECODE[source]
+        to_row, to_col = DECODE[destination]
+        to_index = to_row * 9 + to_col
+        destination_piece = board._board[to_index]
 
         # if a friendly piece is on the destination
         if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
+            if self._owner is destination_piece._owner:
                 return False
 
-        # handle relational movement logic
-        if (abs(to_row - from_row) == 2) and (abs(to_col - from_col) == 1):
-            for square in self.move_path(source, destination):
-                if self.get_board().get_occupant(square) is not None:
-                    return False
-            return True
-
-        elif (abs(to_row - from_row) == 1) and (abs(to_col - from_col) == 2):
-            for square in self.move_path(source, destination):
-                if self.get_board().get_occupant(square) is not None:
-                    return False
-            return True
-
-        else:  # move is not physically allowed
+        # find the squares of the move path
+        path = LEG_MASKS["HO"].get((from_row * 9 + from_col, to_index))
+        if path is None:  # move is not physically allowed
             return False
 
+        # if there is any piece blocking the move path
+        return not board._occ_all & path
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
-        if a defender can intercept an attacker.
+        Returns the squares traversed while making the specified
+        move. The squares of every move are looked up in the LEG_PATHS
+        table, which is built once when the module is loaded. The
+        method is used by Board.is_in_checkmate to determine if a
+        defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
+        :return: Tuple containing squares on the board (in algebraic
                  notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
-                 squares on the move.
+                 Returns an empty tuple if the move is not one that
+                 the piece can make.
         """
-        # set up variables for use throughout method
-        move_path = []
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-
-        # Horses have 8 possible moves, but travel through
-        # only 4 different squares to get to those 8 moves.
-        # They move either a) two rows and one column,
-        # or b) two columns and one row.
-
-        # if a Horse moves up two rows, they travel through
-        # the square one up from the start
-        if (to_row - from_row) == -2:
-            square = self.encode_location(from_row - 1, from_col)
-            move_path.append(square)
-
-        # if a Horse moves down two rows, they travel through
-        # the square one down from the start
-        if (to_row - from_row) == 2:
-            square = self.encode_location(from_row + 1, from_col)
-            move_path.append(square)
-
-        # if a Horse moves right two columns, they travel through
-        # the square one right from the start
-        if (to_col - from_col) == 2:
-            square = self.encode_location(from_row, from_col + 1)
-            move_path.append(square)
-
-        # if a Horse moves left two columns, they travel through
-        # the square one left from the start
-        if (to_col - from_col) == -2:
-            square = self.encode_location(from_row, from_col - 1)
-            move_path.append(square)
-
-        return move_path
+        return LEG_PATHS["HO"].get((source, destination), ())
 
 
 class Chariot(Piece):
@@ -1737,24 +2256,15 @@ class Chariot(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a Chariot object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_chariot_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_chariot_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_chariot_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_chariot_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_chariot_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_chariot_67x67.png'),
+        'red': ('images/pieces/western/red/red_chariot_wooden_67x67.png',
+                'images/pieces/western/red/red_chariot_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
@@ -1764,6 +2274,8 @@ class Chariot(Piece):
         logic appropriate to the movement rules for this piece.
         Interacts with a board object to determine whether there are
         pieces blocking the intended path.
+        The squares of the path are looked up in LINE_PATHS as a mask
+        and tested against the board's occupancy bitboard.
 
         :param source: string - algebraic notation for a location
                                 on the board
@@ -1773,62 +2285,29 @@ class Chariot(Piece):
                  False if the move is not legal
         """
         # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        blue_palace_corners = ['d8', 'f8', 'd10', 'f10']
-        red_palace_corners = ['d1', 'f1', 'd3', 'f3']
-        red_palace_center = 'e2'
-        blue_palace_center = 'e9'
+        board = self._board  # save the Board object
+        if source == self._location:  # use the cached row and column
+            from_row, from_col = self._rc
+        else:
+            from_row, from_col = DECODE[source]
+        to_row, to_col = DECODE[destination]
+        to_index = to_row * 9 + to_col
+        destination_piece = board._board[to_index]
 
         # if a friendly piece is on the destination
         if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
+            if self._owner is destination_piece._owner:
                 return False
 
-        # if there is any piece blocking the move path
-        for square in self.move_path(source, destination):
-            if self.get_board().get_occupant(square) is not None:
-                return False
-
-        # diagonal moves within the palace are allowed.
-        # otherwise, diagonal moves are not allowed
-        if (from_row != to_row) and (from_col != to_col):  # if diagonal
-
-            # handle palace moves
-            if source in palace_corners:
-                if (source in blue_palace_corners
-                        and destination in blue_palace_corners):
-                    return True
-                elif (source in blue_palace_corners
-                        and destination == blue_palace_center):
-                    return True
-                elif (source in red_palace_corners
-                        and destination in red_palace_corners):
-                    return True
-                elif (source in red_palace_corners
-                        and destination == red_palace_center):
-                    return True
-                else:
-                    return False
-
-            elif source == blue_palace_center:
-                if destination in blue_palace_corners:
-                    return True
-                else:
-                    return False
-
-            elif source == red_palace_center:
-                if destination in red_palace_corners:
-                    return True
-                else:
-                    return False
+        # moves along a row or a column, or along a diagonal of the
+        # palace, are found in LINE_PATHS. any other move is not allowed
+        path = LINE_PATHS.get((from_row * 9 + from_col, to_index))
+        if path is None:
+            return False
 
-            # if the move diagonal but not in the palace
-            else:
-                return False
+        # if there is any piece blocking the move path
+        if board._occ_all & path:
+            return False
 
         # if none of the above conditions return False,
         # then the move is legal
@@ -1836,73 +2315,22 @@ class Chariot(Piece):
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
+        Returns the squares traversed while making the specified
+        move. The squares are found by line_move_path, which the
+        Chariot and the Cannon share.
+        The method is used by Board.is_in_checkmate to determine
         if a defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
+        :return: Tuple containing squares on the board (in algebraic
                  notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
+                 Returns an empty tuple if there are no intermediate
                  squares on the move.
         """
-        # set up variables for use throughout method
-        move_path = []
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        blue_palace_corners = ['d8', 'f8', 'd10', 'f10']
-        palace_centers = ['e2', 'e9']
-
-        # if move is from palace corner to corner,
-        # then the only intermediate square is the palace center
-        if (source in palace_corners) and (destination in palace_corners):
-            if abs(to_row - from_row) == abs(to_col - from_col):
-                if source in blue_palace_corners:
-                    move_path.append('e9')
-                else:
-                    move_path.append('e2')
-                return move_path
-
-        # if move is from palace corner to palace center or center to corner,
-        # then there is no intermediate square
-        if ((source in palace_corners and destination in palace_centers)
-              or (destination in palace_corners and source in palace_centers)):
-
-            return move_path
-
-        # if move is orthogonal:
-
-        # horizontal move
-        if from_row == to_row:
-            # add each intermediate square to the move list
-            if to_col > from_col:
-                for column in range(from_col + 1, to_col):
-                    square = self.encode_location(from_row, column)
-                    move_path.append(square)
-            else:
-                for column in range(from_col - 1, to_col, -1):
-                    square = self.encode_location(from_row, column)
-                    move_path.append(square)
-
-        # vertical move
-        if from_col == to_col:
-            # add each intermediate square to the move list
-            if to_row > from_row:
-                for row in range(from_row + 1, to_row):
-                    square = self.encode_location(row, from_col)
-                    move_path.append(square)
-            else:
-                for row in range(from_row - 1, to_row, -1):
-                    square = self.encode_location(row, from_col)
-                    move_path.append(square)
-
-        return move_path
+        return line_move_path(source, destination)
 
 
 class Cannon(Piece):
@@ -1913,33 +2341,21 @@ class Cannon(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a Cannon object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_cannon_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_cannon_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_cannon_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_cannon_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_cannon_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_cannon_67x67.png'),
+        'red': ('images/pieces/western/red/red_cannon_wooden_67x67.png',
+                'images/pieces/western/red/red_cannon_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
         Determines if a move from the source to the destination is
-        legal for this piece. Converts the source and destination
-        from algebraic notation to row, column notation and performs
-        logic appropriate to the movement rules for this piece.
-        Interacts with a board object to determine whether there are
-        pieces blocking the intended path.
+        legal for this piece. The locations are converted to indexes
+        of the game board and the move is checked by _can_jump.
 
         :param source: string - algebraic notation for a location
                                 on the board
@@ -1948,82 +2364,69 @@ class Cannon(Piece):
         :return: True if the move is legal
                  False if the move is not legal
         """
-        # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        blue_palace_corners = ['d8', 'f8', 'd10', 'f10']
-        red_palace_corners = ['d1', 'f1', 'd3', 'f3']
-        red_palace_center = 'e2'
-        blue_palace_center = 'e9'
+        if source == self._location:  # use the cached row and column
+            from_row, from_col = self._rc
+        else:
+            from_row, from_col = DECODE[source]
 
-        # if a friendly piece is on the destination
-        if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
-                return False
+        return self._can_jump(from_row * 9 + from_col, INDEX[destination])
 
-            # if a cannon is on the destination
-            if destination_piece.get_name() == 'CA':
-                return False
+    def _can_attack(self, target_index):
+        """
+        Determines if the piece can legally move from its current
+        location to the square at the given index of the game board.
+        A Cannon's moves depend on the pieces it jumps over, so they
+        cannot be looked up in LEGAL_DEST and are left to _can_jump.
 
-        # evaluate the intended move path for pieces to jump over
-        jumps = 0
-        cannon_in_path = False
+        :param target_index: int - index of the square on the game board
+        :return: True if the move is legal
+                 False if the move is not legal
+        """
+        row, column = self._rc
+        return self._can_jump(row * 9 + column, target_index)
 
-        for square in self.move_path(source, destination):
-            # if there is a piece
-            if self.get_board().get_occupant(square) is not None:
-                jumps += 1
-                # if the piece is a cannon
-                if self.get_board().get_occupant(square).get_name() == "CA":
-                    cannon_in_path = True
+    def _can_jump(self, from_index, to_index):
+        """
+        Determines if a move between two indexes of the game board is
+        legal for this piece. This is the integer core of is_legal and
+        _can_attack: the squares of the path are looked up in
+        LINE_PATHS as a mask, so the pieces on the path are found with
+        a single AND of the board's occupancy bitboard and counted
+        with int.bit_count.
 
-        # if there are 0 or more than 1 pieces to jump
-        if jumps == 0 or jumps > 1:
-            return False
+        :param from_index: int - index of the source square
+        :param to_index: int - index of the destination square
+        :return: True if the move is legal
+                 False if the move is not legal
+        """
+        # set up variables for use throughout method
+        board = self._board  # save the Board object
+        cannons = board._piece_bb["CA"]  # squares with a cannon on them
 
-        # if there is a cannon on the path
-        if cannon_in_path:
+        # if a cannon is on the destination
+        if cannons >> to_index & 1:
             return False
 
-        # diagonal moves within the palace are allowed.
-        # otherwise, diagonal moves are not allowed
-        if (from_row != to_row) and (from_col != to_col):  # if diagonal
+        # if a friendly piece is on the destination
+        if board._occ[self._owner] >> to_index & 1:
+            return False
 
-            # handle palace moves
-            if source in palace_corners:
-                if (source in blue_palace_corners
-                        and destination in blue_palace_corners):
-                    return True
-                elif (source in blue_palace_corners
-                        and destination == blue_palace_center):
-                    return True
-                elif (source in red_palace_corners
-                        and destination in red_palace_corners):
-                    return True
-                elif (source in red_palace_corners
-                        and destination == red_palace_center):
-                    return True
-                else:
-                    return False
+        # moves along a row or a column, or along a diagonal of the
+        # palace, are found in LINE_PATHS. any other move is not allowed
+        path = LINE_PATHS.get((from_index, to_index))
+        if path is None:
+            return False
 
-            elif source == blue_palace_center:
-                if destination in blue_palace_corners:
-                    return True
-                else:
-                    return False
+        # the pieces on the move path are the pieces to jump over
+        jumped = board._occ_all & path
 
-            elif source == red_palace_center:
-                if destination in red_palace_corners:
-                    return True
-                else:
-                    return False
+        # if there are 0 or more than 1 pieces to jump
+        if jumped.bit_count() != 1:
+            return False
 
-            # if the move diagonal but not in the palace
-            else:
-                return False
+        # if there is a cannon on the path
+        if jumped & cannons:
+            return False
 
         # if none of the above conditions return False,
         # then the move is legal
@@ -2031,73 +2434,22 @@ class Cannon(Piece):
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
+        Returns the squares traversed while making the specified
+        move. The squares are found by line_move_path, which the
+        Chariot and the Cannon share.
+        The method is used by Board.is_in_checkmate to determine
         if a defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
+        :return: Tuple containing squares on the board (in algebraic
                  notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
+                 Returns an empty tuple if there are no intermediate
                  squares on the move.
         """
-        # set up variables for use throughout method
-        move_path = []
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        palace_corners = ['d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10']
-        blue_palace_corners = ['d8', 'f8', 'd10', 'f10']
-        palace_centers = ['e2', 'e9']
-
-        # if move is from palace corner to corner,
-        # then the only intermediate square is the palace center
-        if (source in palace_corners) and (destination in palace_corners):
-            if abs(to_row - from_row) == abs(to_col - from_col):
-                if source in blue_palace_corners:
-                    move_path.append('e9')
-                else:
-                    move_path.append('e2')
-                return move_path
-
-        # if move is from palace corner to palace center or center to corner,
-        # then there is no intermediate square
-        if ((source in palace_corners and destination in palace_centers)
-              or (destination in palace_corners and source in palace_centers)):
-
-            return move_path
-
-        # if move is orthogonal:
-
-        # horizontal move
-        if from_row == to_row:
-            # add each intermediate square to the move list
-            if to_col > from_col:
-                for column in range(from_col + 1, to_col):
-                    square = self.encode_location(from_row, column)
-                    move_path.append(square)
-            else:
-                for column in range(from_col - 1, to_col, -1):
-                    square = self.encode_location(from_row, column)
-                    move_path.append(square)
-
-        # vertical move
-        if from_col == to_col:
-            # add each intermediate square to the move list
-            if to_row > from_row:
-                for row in range(from_row + 1, to_row):
-                    square = self.encode_location(row, from_col)
-                    move_path.append(square)
-            else:
-                for row in range(from_row - 1, to_row, -1):
-                    square = self.encode_location(row, from_col)
-                    move_path.append(square)
-
-        return move_path
+        return line_move_path(source, destination)
 
 
 class Soldier(Piece):
@@ -2108,33 +2460,22 @@ class Soldier(Piece):
     generating a list of squares traversed in a move.
     """
 
-    def __init__(self, name, location, owner, board):
-        """
-        Constructs a Soldier object and initializes variables.
+    __slots__ = ()
 
-        :param name: A string containing a two-letter abbreviation
-                     for the piece.
-        :param location: A string containing the algebraic notation for
-                         the square that the piece currently occupies
-        :param owner: A player object who is the owner of the piece
-        :param board: The board object that created the piece object
-        """
-        super().__init__(name, location, owner, board)
-        if owner.get_color() == 'blue':
-            self._image = 'images/pieces/western/blue/blue_pawn_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/blue/blue_pawn_67x67.png'
-        else:
-            self._image = 'images/pieces/western/red/red_pawn_wooden_67x67.png'
-            self._image_highlight = 'images/pieces/western/red/red_pawn_67x67.png'
+    # image filenames by color: (image, highlighted image)
+    _IMAGES = {
+        'blue': ('images/pieces/western/blue/blue_pawn_wooden_67x67.png',
+                 'images/pieces/western/blue/blue_pawn_67x67.png'),
+        'red': ('images/pieces/western/red/red_pawn_wooden_67x67.png',
+                'images/pieces/western/red/red_pawn_67x67.png'),
+    }
 
     def is_legal(self, source, destination):
         """
         Determines if a move from the source to the destination is
-        legal for this piece. Converts the source and destination
-        from algebraic notation to row, column notation and performs
-        logic appropriate to the movement rules for this piece.
-        Interacts with a board object to determine whether there are
-        pieces blocking the intended path.
+        legal for this piece. The moves a Soldier can make from each
+        square are looked up in SOLDIER_MOVES, and the board is checked
+        for a friendly piece on the destination.
 
         :param source: string - algebraic notation for a location
                                 on the board
@@ -2144,76 +2485,74 @@ class Soldier(Piece):
                  False if the move is not legal
         """
         # set up variables for use throughout method
-        game_board = self.get_board().get_board()  # save game board
-        from_row, from_col = self.decode_location(source)
-        to_row, to_col = self.decode_location(destination)
-        destination_piece = game_board[to_row][to_col]
+        destination_piece = self._board._board[INDEX[destination]]
 
         # if a friendly piece is blocking the move
         if destination_piece is not None:
-            if self.get_owner() is destination_piece.get_owner():
+            if self._owner is destination_piece._owner:
                 return False
 
-        # can only move left or right 1 square
-        if from_row == to_row:
-            if abs(to_col - from_col) != 1:
-                return False
-
-        # can only move forward 1 square
-        if from_col == to_col:
-            if self.get_owner().get_color() == 'blue':
-                if (to_row - from_row) != -1:
-                    return False
-            else:
-                if (to_row - from_row) != 1:
-                    return False
-
-        # diagonal moves within the palace are allowed.
-        # otherwise, diagonal moves are not allowed
-        if (from_row != to_row) and (from_col != to_col):
-            if source == 'd3' or source == 'f3':
-                if destination == 'e2':
-                    return True
-                else:
-                    return False
-            elif source == 'e2':
-                if destination == 'd1' or destination == 'f1':
-                    return True
-                else:
-                    return False
-            elif source == 'd8' or source == 'f8':
-                if destination == 'e9':
-                    return True
-                else:
-                    return False
-            elif source == 'e9':
-                if destination == 'd10' or destination == 'f10':
-                    return True
-                else:
-                    return False
-            else:
-                return False
-
-        return True
+        # the move must be one of the moves in SOLDIER_MOVES
+        return destination in SOLDIER_MOVES[self._owner._color][source]
 
     def move_path(self, source, destination):
         """
-        Returns a list of all of the squares traversed while making
-        the specified move. The list is generated by implementing a
-        move square by square and then appending each square to the
-        list. The method is used by Board.is_in_checkmate to determine
+        Returns the squares traversed while making the specified
+        move. This piece only ever moves one square, so there are no
+        intermediate squares and the shared empty tuple is returned.
+        The method is used by Board.is_in_checkmate to determine
         if a defender can intercept an attacker.
 
         :param source: string - algebraic notation for a location
                                 on the board
         :param destination: string - algebraic notation for a location
                                      on the board
-        :return: List containing squares on the board (in algebraic
-                 notation) that the piece will traverse during move.
-                 Returns an empty list if there are no intermediate
-                 squares on the move.
+        :return: empty tuple
         """
-        return self.get_move_path()  # Soldier has no intermediate moves
+        return self._EMPTY_PATH  # Soldier has no intermediate moves
+
+
+def build_move_tables():
+    """
+    Builds the tables used by Piece._can_attack by asking each type of
+    piece (other than the Cannon, which needs a piece to jump over)
+    which moves it can make on an empty board, from every square and
+    for either player.
+    LEGAL_DEST[name][color][index] is a frozenset of the indexes that
+    a piece can move to from the square at index, and
+    MOVE_PATH[name][(source, destination)] is a mask of the squares it
+    passes through on each of those moves.
+
+    :return: (LEGAL_DEST, MOVE_PATH)
+    """
+    board = Board(None)  # an empty board
+    piece_classes = {"GN": General, "GD": Guard, "EL": Elephant,
+                     "HO": Horse, "CH": Chariot, "SD": Soldier}
+    legal_dest = {name: {} for name in piece_classes}
+    move_path = {name: {} for name in piece_classes}
+
+    for name, piece_class in piece_classes.items():
+        for color in ["blue", "red"]:
+            piece = piece_class(name, "a1", Player(color), board)
+            legal_dest[name][color] = []
+            for source_index in range(90):
+                source = ENCODE[divmod(source_index, 9)]
+                piece.set_location(source)
+                targets = set()
+                for dest_index in range(90):
+                    destination = ENCODE[divmod(dest_index, 9)]
+                    if piece.is_legal(source, destination):
+                        targets.add(dest_index)
+                        move_path[name][(source_index, dest_index)] = sum(
+                            1 << INDEX[square]
+                            for square in piece.move_path(source, destination)
+                        )
+                legal_dest[name][color].append(frozenset(targets))
+
+    return legal_dest, move_path
+
+
+LEGAL_DEST, MOVE_PATH = build_move_tables()
 
 
 def main():
@@ -2,6 +2,8 @@ SCREEN_WIDTH = 615
 SCREEN_HEIGHT = 800
 BG_X_OFFSET = 6
 BG_Y_OFFSET = 55
+# width and height in pixels of a square of the game board
+SQUARE_SIZE = 67
 FILL_COLOR = (199, 158, 89)
 BLUE = (17, 45, 148)
 RED = (225, 40, 16)